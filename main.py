@@ -13,4 +13,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from src.bot import main
 
 if __name__ == "__main__":
+    # Use uvloop's faster event loop when it is installed
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+
     asyncio.run(main())
@@ -98,6 +98,7 @@ class IVASMSBot:
             # Start monitor
             await self.monitor.start()
             self.telegram_bot.is_monitoring = True
+            self.telegram_bot.invalidate_status()
             
             # Start heartbeat task
             if self.config.heartbeat_interval_hours > 0:
@@ -141,6 +142,7 @@ class IVASMSBot:
                 await self.monitor.stop()
                 if self.telegram_bot:
                     self.telegram_bot.is_monitoring = False
+                    self.telegram_bot.invalidate_status()
             
             # Stop heartbeat task
             if self.heartbeat_task and not self.heartbeat_task.done():
@@ -231,6 +233,7 @@ class IVASMSBot:
                 
                 if deleted_count > 0:
                     logger.info(f"Cleanup: deleted {deleted_count} old OTPs")
+                    self.telegram_bot.invalidate_otp_count()
                     await self.telegram_bot.send_status_message(
                         f"🧹 Cleanup: deleted {deleted_count} old OTPs"
                     )
@@ -287,6 +287,9 @@ class OTPMonitor:
                     else:
                         logger.info(f"DRY RUN: Would send OTP notification for {otp_id}")
 
+        if new_otps:
+            self.telegram_bot.invalidate_otp_count()
+
         # Update last seen OTP ID
         if latest_id != last_seen_id:
             await self.storage.set_last_seen_otp_id(latest_id)
@@ -4,15 +4,22 @@ Handles all bot commands and message sending functionality.
 """
 
 import asyncio
+import functools
+import io
+import itertools
 import logging
 import os
+import re
 import subprocess
+import time
 import traceback
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from telegram import Update
 from telegram.constants import ParseMode
+from telegram.error import RetryAfter
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -23,6 +30,75 @@ from telegram.ext import (
 
 logger = logging.getLogger(__name__)
 
+# Characters that must be escaped in MarkdownV2 text
+_MD_SPECIAL = "_*[]()~`>#+-=|{}.!"
+_MD_TABLE = str.maketrans({char: f"\\{char}" for char in _MD_SPECIAL})
+_MD_SPECIAL_RE = re.compile(f"[{re.escape(_MD_SPECIAL)}]")
+
+# Inside MarkdownV2 code blocks only backslashes and backticks are escaped
+_MD_CODE_TABLE = str.maketrans({"\\": "\\\\", "`": "\\`"})
+
+# Log replies longer than this are sent as a file instead of inline,
+# keeping clear of Telegram's 4096 character message limit
+MAX_INLINE_LOG_CHARS = 4000
+
+# Telegram allows roughly 30 messages per second across all chats
+MESSAGES_PER_SECOND = 30
+MAX_CONCURRENT_SENDS = 25
+MAX_SEND_ATTEMPTS = 3
+
+# Outgoing message priorities (lower is sent first)
+PRIORITY_OTP = 0
+PRIORITY_STATUS = 1
+
+# Identical status/error messages within this window are coalesced
+COALESCE_WINDOW_SECONDS = 1.0
+
+# Telegram allows about one message per second to the same chat
+PER_CHAT_INTERVAL_SECONDS = 1.0
+CHAT_QUEUE_SIZE = 256
+
+# How long a cached OTP count is trusted before re-querying storage
+OTP_COUNT_CACHE_TTL_SECONDS = 5
+
+# How long a rendered /status reply is reused
+STATUS_CACHE_TTL_SECONDS = 2
+
+# Innermost stack frames included in error notifications
+TRACEBACK_FRAME_LIMIT = 5
+
+# /start reply, already escaped for MarkdownV2
+_START_TEMPLATE = (
+    "🤖 *iVASMS Telegram Bot*\n\n"
+    "Status: {status}\n"
+    "Uptime: {uptime}\n"
+    "Admin Chat ID: `{chat_id}`\n\n"
+    "Available commands:\n"
+    "• `/status` \\- Bot status\n"
+    "• `/config` \\- Configuration\n"
+    "• `/recent_otps` \\- Recent OTPs\n"
+    "• `/last_otp` \\- Last OTP\n"
+    "• `/new_otp` \\- Force fetch\n"
+    "• `/logs` \\- View logs\n"
+)
+
+
+def _read_tail(path: str, lines: int) -> List[str]:
+    """Read the last lines of a file without holding it all in memory."""
+    with open(path, 'r') as f:
+        return list(deque(f, maxlen=lines))
+
+
+def admin_only(handler):
+    """Reject commands from chats that are not authorized admins."""
+    @functools.wraps(handler)
+    async def wrapper(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        if not self.is_admin(update.effective_chat.id):
+            await update.message.reply_text("❌ Unauthorized access")
+            return
+        return await handler(self, update, context)
+    return wrapper
+
 
 class IVASMSTelegramBot:
     """Telegram bot for OTP notifications and management."""
@@ -35,17 +111,41 @@ class IVASMSTelegramBot:
         monitor_manager,
     ):
         self.token = token
-        self.admin_chat_ids = admin_chat_ids
+        self.admin_chat_ids: FrozenSet[int] = frozenset(admin_chat_ids)
         self.storage = storage_manager
         self.monitor = monitor_manager
         
         self.application: Optional[Application] = None
         self.start_time = datetime.now()
+        self._start_monotonic = time.monotonic()
         
         # Bot status
         self.is_monitoring = False
         self.last_login_time: Optional[datetime] = None
         self.last_fetch_time: Optional[datetime] = None
+        self._uptime_cache: Optional[Tuple[int, str]] = None
+        self._otp_count_cache: Optional[Tuple[float, int]] = None
+        self._otp_count_generation = 0
+        self._status_cache: Optional[Tuple[float, str]] = None
+        self._status_generation = 0
+
+        # Outgoing message rate limiting (token bucket)
+        self._send_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        self._rate_lock = asyncio.Lock()
+        self._rate_tokens = float(MESSAGES_PER_SECOND)
+        self._rate_updated = time.monotonic()
+
+        # Outgoing message queue, drained by the sender loop while running
+        self._send_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._send_sequence = itertools.count()
+        self._sender_task: Optional[asyncio.Task] = None
+        self._repeated_count = 0
+        self._repeated_item: Optional[Tuple[int, str, ParseMode]] = None
+        
+        # Per-chat write queues so one slow chat does not hold up the others
+        self._chat_queues: Dict[int, asyncio.PriorityQueue] = {}
+        self._chat_tasks: Dict[int, asyncio.Task] = {}
+        self._chat_pending: Dict[int, tuple] = {}
 
     async def initialize(self):
         """Initialize the Telegram bot application."""
@@ -54,23 +154,28 @@ class IVASMSTelegramBot:
             self.application = Application.builder().token(self.token).build()
             
             # Add command handlers
-            self.application.add_handler(CommandHandler("start", self.start_command))
-            self.application.add_handler(CommandHandler("status", self.status_command))
-            self.application.add_handler(CommandHandler("config", self.config_command))
-            self.application.add_handler(CommandHandler("info", self.info_command))
-            self.application.add_handler(CommandHandler("recent_otps", self.recent_otps_command))
-            self.application.add_handler(CommandHandler("last_otp", self.last_otp_command))
-            self.application.add_handler(CommandHandler("new_otp", self.new_otp_command))
-            self.application.add_handler(CommandHandler("restart", self.restart_command))
-            self.application.add_handler(CommandHandler("stop", self.stop_command))
-            self.application.add_handler(CommandHandler("start_monitor", self.start_monitor_command))
-            self.application.add_handler(CommandHandler("logs", self.logs_command))
+            commands = (
+                ("start", self.start_command),
+                ("status", self.status_command),
+                ("config", self.config_command),
+                ("info", self.info_command),
+                ("recent_otps", self.recent_otps_command),
+                ("last_otp", self.last_otp_command),
+                ("new_otp", self.new_otp_command),
+                ("restart", self.restart_command),
+                ("stop", self.stop_command),
+                ("start_monitor", self.start_monitor_command),
+                ("logs", self.logs_command),
+            )
+            handlers = [CommandHandler(name, callback) for name, callback in commands]
             
             # Add message handler for non-commands
-            self.application.add_handler(
+            handlers.append(
                 MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message)
             )
             
+            self.application.add_handlers(handlers)
+            
             logger.info("Telegram bot initialized successfully")
             
         except Exception as e:
@@ -85,85 +190,253 @@ class IVASMSTelegramBot:
         self, 
         message: str, 
         parse_mode: ParseMode = ParseMode.MARKDOWN_V2,
-        disable_notification: bool = False
+        disable_notification: bool = False,
+        priority: int = PRIORITY_STATUS,
     ):
         """Send message to all admin chats."""
         if not self.application:
             logger.error("Bot application not initialized")
             return
             
-        for chat_id in self.admin_chat_ids:
+        # Queue behind higher-priority messages while the sender loop is running
+        if self._sender_task and not self._sender_task.done():
+            await self._send_queue.put(
+                (priority, next(self._send_sequence), message, parse_mode, disable_notification)
+            )
+            return
+            
+        await self._deliver(message, parse_mode, disable_notification, priority)
+
+    async def _deliver(
+        self,
+        message: str,
+        parse_mode: ParseMode,
+        disable_notification: bool,
+        priority: int = PRIORITY_STATUS,
+    ):
+        """Deliver message to all admin chats."""
+        if self._chat_tasks:
+            # Hand off to the per-chat write queues without waiting
+            item = (priority, next(self._send_sequence), message, parse_mode, disable_notification)
+            for chat_id, queue in self._chat_queues.items():
+                try:
+                    queue.put_nowait(item)
+                except asyncio.QueueFull:
+                    logger.warning(f"Send queue full for admin {chat_id}, dropping message")
+            return
+            
+        async def _send_one(chat_id: int):
             try:
-                await self.application.bot.send_message(
-                    chat_id=chat_id,
-                    text=message,
-                    parse_mode=parse_mode,
-                    disable_notification=disable_notification,
-                )
+                await self._send_message(chat_id, message, parse_mode, disable_notification)
             except Exception as e:
                 logger.error(f"Failed to send message to admin {chat_id}: {e}")
 
+        # Fan out to all admins concurrently
+        await asyncio.gather(*(_send_one(chat_id) for chat_id in self.admin_chat_ids))
+
+    async def _sender_loop(self):
+        """Send queued messages in priority order, coalescing repeats."""
+        last_message: Optional[str] = None
+        last_seen_at = 0.0
+        
+        while True:
+            try:
+                if self._repeated_count:
+                    # Report suppressed repeats once the burst goes quiet
+                    quiet_in = COALESCE_WINDOW_SECONDS - (time.monotonic() - last_seen_at)
+                    if quiet_in <= 0:
+                        await self._flush_repeat_notice()
+                        continue
+                    try:
+                        item = await asyncio.wait_for(self._send_queue.get(), timeout=quiet_in)
+                    except asyncio.TimeoutError:
+                        await self._flush_repeat_notice()
+                        continue
+                else:
+                    item = await self._send_queue.get()
+                    
+                priority, _, message, parse_mode, disable_notification = item
+                
+                # OTPs are never coalesced and do not interrupt a burst
+                if priority == PRIORITY_OTP:
+                    await self._deliver(message, parse_mode, disable_notification, priority)
+                    continue
+                    
+                # Each duplicate extends the window, so a sustained stream
+                # collapses into one message and one count notice
+                now = time.monotonic()
+                if message == last_message and now - last_seen_at < COALESCE_WINDOW_SECONDS:
+                    self._repeated_count += 1
+                    last_seen_at = now
+                    continue
+                    
+                await self._flush_repeat_notice()
+                    
+                await self._deliver(message, parse_mode, disable_notification, priority)
+                last_message = message
+                last_seen_at = time.monotonic()
+                self._repeated_item = (priority, message, parse_mode)
+                
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in sender loop: {e}")
+
+    async def _flush_repeat_notice(self):
+        """Send the notice for coalesced duplicate messages, if any."""
+        if not self._repeated_count:
+            return
+            
+        count = self._repeated_count
+        self._repeated_count = 0
+        priority, message, parse_mode = self._repeated_item
+        
+        # Quote the repeated message so the notice still makes sense if
+        # higher-priority messages are delivered in between
+        notice = f"Previous message repeated {count} more time(s):"
+        if parse_mode == ParseMode.MARKDOWN_V2:
+            notice = self.escape_markdown(notice)
+        await self._deliver(f"⚠️ {notice}\n\n{message}", parse_mode, True, priority)
+
+    async def _drain_chat(self, chat_id: int):
+        """Send queued messages to one chat, at most one per interval."""
+        queue = self._chat_queues[chat_id]
+        last_sent_at = 0.0
+        
+        while True:
+            item = await queue.get()
+            
+            # Keep track of the dequeued item until it is sent (or fails), so
+            # shutdown can still send it if this task is cancelled meanwhile
+            self._chat_pending[chat_id] = item
+            wait = PER_CHAT_INTERVAL_SECONDS - (time.monotonic() - last_sent_at)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                
+            _, _, message, parse_mode, disable_notification = item
+            try:
+                await self._send_message(chat_id, message, parse_mode, disable_notification)
+            except Exception as e:
+                logger.error(f"Failed to send message to admin {chat_id}: {e}")
+            del self._chat_pending[chat_id]
+            last_sent_at = time.monotonic()
+
+    def _start_senders(self):
+        """Start the sender loop and the per-chat write queues."""
+        self._chat_queues = {
+            chat_id: asyncio.PriorityQueue(maxsize=CHAT_QUEUE_SIZE)
+            for chat_id in self.admin_chat_ids
+        }
+        self._chat_tasks = {
+            chat_id: asyncio.create_task(self._drain_chat(chat_id))
+            for chat_id in self.admin_chat_ids
+        }
+        self._sender_task = asyncio.create_task(self._sender_loop())
+
+    async def _stop_senders(self):
+        """Stop all sender tasks and deliver anything still queued."""
+        tasks = list(self._chat_tasks.values())
+        if self._sender_task:
+            tasks.append(self._sender_task)
+            
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        self._sender_task = None
+        self._chat_tasks = {}
+        
+        # Flush leftovers directly now that the queues are no longer drained,
+        # oldest first: per-chat items, then anything not yet dispatched
+        for chat_id, queue in self._chat_queues.items():
+            pending = []
+            if chat_id in self._chat_pending:
+                pending.append(self._chat_pending.pop(chat_id))
+            while not queue.empty():
+                pending.append(queue.get_nowait())
+                
+            for _, _, message, parse_mode, disable_notification in pending:
+                try:
+                    await self._send_message(chat_id, message, parse_mode, disable_notification)
+                except Exception as e:
+                    logger.error(f"Failed to send message to admin {chat_id}: {e}")
+        self._chat_queues = {}
+        
+        await self._flush_repeat_notice()
+        
+        while not self._send_queue.empty():
+            _, _, message, parse_mode, disable_notification = self._send_queue.get_nowait()
+            await self._deliver(message, parse_mode, disable_notification)
+
+    async def _send_message(
+        self,
+        chat_id: int,
+        text: str,
+        parse_mode: ParseMode,
+        disable_notification: bool,
+    ):
+        """Send a single message while respecting Telegram rate limits."""
+        async with self._send_semaphore:
+            for attempt in range(1, MAX_SEND_ATTEMPTS + 1):
+                await self._acquire_rate_token()
+                try:
+                    return await self.application.bot.send_message(
+                        chat_id=chat_id,
+                        text=text,
+                        parse_mode=parse_mode,
+                        disable_notification=disable_notification,
+                    )
+                except RetryAfter as e:
+                    if attempt == MAX_SEND_ATTEMPTS:
+                        raise
+                    logger.warning(f"Rate limited by Telegram, retrying in {e.retry_after}s")
+                    await asyncio.sleep(e.retry_after)
+
+    async def _acquire_rate_token(self):
+        """Wait until the token bucket allows another message."""
+        async with self._rate_lock:
+            while True:
+                now = time.monotonic()
+                elapsed = now - self._rate_updated
+                self._rate_updated = now
+                self._rate_tokens = min(
+                    float(MESSAGES_PER_SECOND),
+                    self._rate_tokens + elapsed * MESSAGES_PER_SECOND,
+                )
+                
+                if self._rate_tokens >= 1:
+                    self._rate_tokens -= 1
+                    return
+                    
+                await asyncio.sleep((1 - self._rate_tokens) / MESSAGES_PER_SECOND)
+
     def escape_markdown(self, text: str) -> str:
         """Escape special characters for MarkdownV2."""
-        special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-        for char in special_chars:
-            text = text.replace(char, f'\\{char}')
-        return text
+        # Most values (IDs, numbers, plain words) need no escaping at all
+        if not _MD_SPECIAL_RE.search(text):
+            return text
+        return text.translate(_MD_TABLE)
 
+    @admin_only
     async def start_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
-        status_text = "🤖 *iVASMS Telegram Bot*\n\n"
-        status_text += f"Status: {'🟢 Running' if self.is_monitoring else '🔴 Stopped'}\n"
-        status_text += f"Uptime: {self._get_uptime()}\n"
-        status_text += f"Admin Chat ID: `{update.effective_chat.id}`\n\n"
-        status_text += "Available commands:\n"
-        status_text += "• `/status` \\- Bot status\n"
-        status_text += "• `/config` \\- Configuration\n"
-        status_text += "• `/recent_otps` \\- Recent OTPs\n"
-        status_text += "• `/last_otp` \\- Last OTP\n"
-        status_text += "• `/new_otp` \\- Force fetch\n"
-        status_text += "• `/logs` \\- View logs\n"
+        status_text = _START_TEMPLATE.format(
+            status="🟢 Running" if self.is_monitoring else "🔴 Stopped",
+            uptime=self._get_uptime(),
+            chat_id=update.effective_chat.id,
+        )
         
         await update.message.reply_text(status_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def status_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
-        status_text = "📊 *Bot Status*\n\n"
-        status_text += f"Monitoring: {'🟢 Active' if self.is_monitoring else '🔴 Inactive'}\n"
-        status_text += f"Uptime: {self._get_uptime()}\n"
-        
-        if self.last_login_time:
-            login_time = self.last_login_time.strftime("%Y\\-%m\\-%d %H:%M:%S")
-            status_text += f"Last Login: {login_time}\n"
-        else:
-            status_text += "Last Login: Never\n"
-            
-        if self.last_fetch_time:
-            fetch_time = self.last_fetch_time.strftime("%Y\\-%m\\-%d %H:%M:%S")
-            status_text += f"Last Fetch: {fetch_time}\n"
-        else:
-            status_text += "Last Fetch: Never\n"
-            
-        # Get OTP count
-        otp_count = await self.storage.get_otp_count()
-        status_text += f"Total OTPs: {otp_count}\n"
-        
+        status_text = await self._build_status_text()
         await update.message.reply_text(status_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def config_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /config command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         # Mask sensitive information
         email = os.getenv("IVASMS_EMAIL", "Not set")
         if email != "Not set" and "@" in email:
@@ -182,12 +455,9 @@ class IVASMSTelegramBot:
 
         await update.message.reply_text(config_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def info_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /info command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         # Get git info
         try:
             commit_sha = subprocess.check_output(
@@ -216,12 +486,9 @@ class IVASMSTelegramBot:
 
         await update.message.reply_text(info_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def recent_otps_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /recent_otps command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         # Parse limit from command args
         limit = 10
         if context.args:
@@ -257,12 +524,9 @@ class IVASMSTelegramBot:
         else:
             await update.message.reply_text(response_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def last_otp_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /last_otp command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         otp = await self.storage.get_last_otp()
         
         if not otp:
@@ -278,12 +542,9 @@ class IVASMSTelegramBot:
 
         await update.message.reply_text(response_text, parse_mode=ParseMode.MARKDOWN_V2)
 
+    @admin_only
     async def new_otp_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /new_otp command - force manual fetch."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         await update.message.reply_text("🔄 Forcing OTP fetch...")
         
         try:
@@ -298,12 +559,9 @@ class IVASMSTelegramBot:
             logger.error(f"Manual fetch failed: {e}")
             await update.message.reply_text(f"❌ Fetch failed: {str(e)}")
 
+    @admin_only
     async def restart_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /restart command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         await update.message.reply_text("🔄 Restarting bot...")
         
         try:
@@ -313,6 +571,7 @@ class IVASMSTelegramBot:
             # Restart monitoring
             await self.monitor.start()
             self.is_monitoring = True
+            self.invalidate_status()
             
             await update.message.reply_text("✅ Bot restarted successfully")
             
@@ -320,22 +579,17 @@ class IVASMSTelegramBot:
             logger.error(f"Restart failed: {e}")
             await update.message.reply_text(f"❌ Restart failed: {str(e)}")
 
+    @admin_only
     async def stop_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /stop command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         await self.monitor.stop()
         self.is_monitoring = False
+        self.invalidate_status()
         await update.message.reply_text("🛑 Monitoring stopped")
 
+    @admin_only
     async def start_monitor_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start_monitor command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         if self.is_monitoring:
             await update.message.reply_text("ℹ️ Monitoring is already active")
             return
@@ -343,17 +597,15 @@ class IVASMSTelegramBot:
         try:
             await self.monitor.start()
             self.is_monitoring = True
+            self.invalidate_status()
             await update.message.reply_text("▶️ Monitoring started")
         except Exception as e:
             logger.error(f"Failed to start monitoring: {e}")
             await update.message.reply_text(f"❌ Failed to start monitoring: {str(e)}")
 
+    @admin_only
     async def logs_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /logs command."""
-        if not self.is_admin(update.effective_chat.id):
-            await update.message.reply_text("❌ Unauthorized access")
-            return
-
         # Parse lines from command args
         lines = 20
         if context.args:
@@ -367,15 +619,19 @@ class IVASMSTelegramBot:
         try:
             log_file = os.getenv("LOG_FILE", "./logs/bot.log")
             
-            if not os.path.exists(log_file):
+            try:
+                log_size = os.stat(log_file).st_size
+            except FileNotFoundError:
                 await update.message.reply_text("📄 Log file not found")
                 return
 
-            # Read last N lines
-            with open(log_file, 'r') as f:
-                log_lines = f.readlines()
+            if log_size == 0:
+                await update.message.reply_text("📄 Log file is empty")
+                return
+
+            # Read last N lines in a worker thread to keep the event loop free
+            recent_lines = await asyncio.to_thread(_read_tail, log_file, lines)
                 
-            recent_lines = log_lines[-lines:] if len(log_lines) > lines else log_lines
             log_text = ''.join(recent_lines)
             
             if not log_text.strip():
@@ -383,15 +639,18 @@ class IVASMSTelegramBot:
                 return
 
             response_text = f"📄 *Last {len(recent_lines)} log lines*\n\n"
-            response_text += f"```\n{log_text}\n```"
+            response_text += f"```\n{log_text.translate(_MD_CODE_TABLE)}\n```"
+
+            # Send long tails as a document rather than splitting code blocks
+            if len(response_text) > MAX_INLINE_LOG_CHARS:
+                await update.message.reply_document(
+                    document=io.BytesIO(log_text.encode()),
+                    filename="bot.log.tail",
+                    caption=f"📄 Last {len(recent_lines)} log lines",
+                )
+                return
 
-            # Split long messages
-            if len(response_text) > 4000:
-                chunks = self._split_message(response_text, 4000)
-                for chunk in chunks:
-                    await update.message.reply_text(chunk, parse_mode=ParseMode.MARKDOWN_V2)
-            else:
-                await update.message.reply_text(response_text, parse_mode=ParseMode.MARKDOWN_V2)
+            await update.message.reply_text(response_text, parse_mode=ParseMode.MARKDOWN_V2)
 
         except Exception as e:
             logger.error(f"Failed to read logs: {e}")
@@ -409,17 +668,82 @@ class IVASMSTelegramBot:
 
     def _get_uptime(self) -> str:
         """Get bot uptime as formatted string."""
-        uptime = datetime.now() - self.start_time
-        days = uptime.days
-        hours, remainder = divmod(uptime.seconds, 3600)
-        minutes, _ = divmod(remainder, 60)
+        elapsed = int(time.monotonic() - self._start_monotonic)
+        
+        # Uptime is shown with minute resolution, so reuse the last string
+        # until the minute changes
+        minute_bucket = elapsed // 60
+        if self._uptime_cache and self._uptime_cache[0] == minute_bucket:
+            return self._uptime_cache[1]
+        
+        days, remainder = divmod(minute_bucket, 1440)
+        hours, minutes = divmod(remainder, 60)
         
         if days > 0:
-            return f"{days}d {hours}h {minutes}m"
+            uptime_str = f"{days}d {hours}h {minutes}m"
         elif hours > 0:
-            return f"{hours}h {minutes}m"
+            uptime_str = f"{hours}h {minutes}m"
+        else:
+            uptime_str = f"{minutes}m"
+            
+        self._uptime_cache = (minute_bucket, uptime_str)
+        return uptime_str
+
+    async def _build_status_text(self) -> str:
+        """Build the /status reply, reused for a couple of seconds."""
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < STATUS_CACHE_TTL_SECONDS:
+            return self._status_cache[1]
+            
+        generation = self._status_generation
+        status_text = "📊 *Bot Status*\n\n"
+        status_text += f"Monitoring: {'🟢 Active' if self.is_monitoring else '🔴 Inactive'}\n"
+        status_text += f"Uptime: {self._get_uptime()}\n"
+        
+        if self.last_login_time:
+            login_time = self.last_login_time.strftime("%Y\\-%m\\-%d %H:%M:%S")
+            status_text += f"Last Login: {login_time}\n"
+        else:
+            status_text += "Last Login: Never\n"
+            
+        if self.last_fetch_time:
+            fetch_time = self.last_fetch_time.strftime("%Y\\-%m\\-%d %H:%M:%S")
+            status_text += f"Last Fetch: {fetch_time}\n"
         else:
-            return f"{minutes}m"
+            status_text += "Last Fetch: Never\n"
+            
+        # Get OTP count
+        otp_count = await self._get_otp_count()
+        status_text += f"Total OTPs: {otp_count}\n"
+        
+        # Don't cache text for state that changed while the count was fetched
+        if generation == self._status_generation:
+            self._status_cache = (now, status_text)
+        return status_text
+
+    def invalidate_status(self):
+        """Drop the cached /status reply after bot state changes."""
+        self._status_cache = None
+        self._status_generation += 1
+
+    async def _get_otp_count(self) -> int:
+        """Get total OTP count, cached for a few seconds."""
+        now = time.monotonic()
+        if self._otp_count_cache and now - self._otp_count_cache[0] < OTP_COUNT_CACHE_TTL_SECONDS:
+            return self._otp_count_cache[1]
+            
+        # Don't cache a count that was invalidated while it was being fetched
+        generation = self._otp_count_generation
+        otp_count = await self.storage.get_otp_count()
+        if generation == self._otp_count_generation:
+            self._otp_count_cache = (now, otp_count)
+        return otp_count
+
+    def invalidate_otp_count(self):
+        """Drop the cached OTP count after OTPs are stored or deleted."""
+        self._otp_count_cache = None
+        self._otp_count_generation += 1
+        self.invalidate_status()
 
     def _split_message(self, text: str, max_length: int) -> List[str]:
         """Split long message into chunks."""
@@ -457,7 +781,7 @@ class IVASMSTelegramBot:
             if otp.get('service'):
                 message += f"Source: `{self.escape_markdown(otp['service'])}`\n"
 
-            await self.send_admin_message(message)
+            await self.send_admin_message(message, priority=PRIORITY_OTP)
             
         except Exception as e:
             logger.error(f"Failed to send OTP notification: {e}")
@@ -480,7 +804,11 @@ class IVASMSTelegramBot:
             error_msg += f"\n\n`{self.escape_markdown(str(error))}`"
             
             # Add stack trace for debugging (truncated)
-            stack_trace = traceback.format_exc()
+            stack_trace = "".join(
+                traceback.format_exception(
+                    type(error), error, error.__traceback__, limit=-TRACEBACK_FRAME_LIMIT
+                )
+            )
             if len(stack_trace) > 500:
                 stack_trace = stack_trace[:500] + "..."
             
@@ -504,6 +832,9 @@ class IVASMSTelegramBot:
             await self.application.start()
             await self.application.updater.start_polling()
             
+            # Start the outgoing message queues
+            self._start_senders()
+            
             logger.info("Telegram bot is running")
             
             # Keep running
@@ -515,6 +846,7 @@ class IVASMSTelegramBot:
             await self.send_error_message(e, "Bot runtime")
             raise
         finally:
+            await self._stop_senders()
             if self.application:
                 await self.application.updater.stop()
                 await self.application.stop()
@@ -523,7 +855,9 @@ class IVASMSTelegramBot:
     def update_login_time(self):
         """Update last login time."""
         self.last_login_time = datetime.now()
+        self.invalidate_status()
 
     def update_fetch_time(self):
         """Update last fetch time."""
         self.last_fetch_time = datetime.now()
+        self.invalidate_status()
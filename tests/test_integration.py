@@ -5,15 +5,19 @@ Integration tests for the bot components.
 import asyncio
 import os
 import tempfile
+import time
+from datetime import timedelta
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 
+from telegram.error import RetryAfter
+
 import sys
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from src.storage import StorageManager
 from src.monitor import OTPMonitor
-from src.telegram_bot import IVASMSTelegramBot
+from src.telegram_bot import IVASMSTelegramBot, PRIORITY_OTP
 
 
 @pytest.fixture
@@ -43,6 +47,7 @@ def mock_telegram_bot():
     bot.send_error_message = AsyncMock()
     bot.update_login_time = MagicMock()
     bot.update_fetch_time = MagicMock()
+    bot.invalidate_otp_count = MagicMock()
     return bot
 
 
@@ -100,6 +105,9 @@ async def test_monitor_otp_processing(storage_manager, mock_telegram_bot, sample
     # Check that notifications were sent
     assert mock_telegram_bot.send_otp_notification.call_count == 2
     
+    # Cached OTP count should be invalidated
+    mock_telegram_bot.invalidate_otp_count.assert_called()
+    
     # Process same OTPs again - should not create duplicates
     new_otps = await monitor._process_otps(sample_otps)
     assert len(new_otps) == 0  # No new OTPs
@@ -246,6 +254,29 @@ async def test_telegram_bot_admin_validation():
     assert bot.is_admin(555666777) is False
 
 
+@pytest.mark.asyncio
+async def test_telegram_bot_rejects_non_admin_commands():
+    """Test admin-only commands reply with an error for other chats."""
+    storage = MagicMock()
+    storage.get_last_otp = AsyncMock()
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=storage,
+        monitor_manager=None
+    )
+
+    update = MagicMock()
+    update.effective_chat.id = 555666777
+    update.message.reply_text = AsyncMock()
+
+    await bot.last_otp_command(update, MagicMock())
+
+    update.message.reply_text.assert_called_once_with("❌ Unauthorized access")
+    storage.get_last_otp.assert_not_called()
+
+
 @pytest.mark.asyncio
 async def test_telegram_bot_markdown_escaping():
     """Test Telegram bot markdown escaping."""
@@ -266,6 +297,443 @@ async def test_telegram_bot_markdown_escaping():
     assert "[" not in escaped or "\\[" in escaped
 
 
+@pytest.mark.asyncio
+async def test_telegram_bot_markdown_escaping_all_chars():
+    """Test every MarkdownV2 special character is escaped exactly once."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    special_chars = "_*[]()~`>#+-=|{}.!"
+    escaped = bot.escape_markdown(f"a{special_chars}b")
+
+    assert escaped == "a" + "".join(f"\\{char}" for char in special_chars) + "b"
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_admin_message_fan_out():
+    """Test admin messages reach every admin even if one send fails."""
+    admin_chat_ids = [123456789, 987654321]
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=admin_chat_ids,
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock(side_effect=[Exception("blocked"), None])
+
+    await bot.send_admin_message("hello")
+
+    sent_to = {call.kwargs['chat_id'] for call in bot.application.bot.send_message.call_args_list}
+    assert sent_to == set(admin_chat_ids)
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_retries_after_rate_limit():
+    """Test admin messages are retried when Telegram asks us to back off."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock(side_effect=[RetryAfter(0), None])
+
+    await bot.send_admin_message("hello")
+
+    assert bot.application.bot.send_message.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_send_queue_priority_and_coalescing(monkeypatch):
+    """Test queued OTPs jump ahead of status messages and repeats are coalesced."""
+    monkeypatch.setattr("src.telegram_bot.COALESCE_WINDOW_SECONDS", 0.1)
+    monkeypatch.setattr("src.telegram_bot.PER_CHAT_INTERVAL_SECONDS", 0)
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+    bot._start_senders()
+
+    await bot.send_admin_message("status")
+    await bot.send_admin_message("status")
+    await bot.send_admin_message("status")
+    await bot.send_admin_message("otp", priority=PRIORITY_OTP)
+
+    await asyncio.sleep(0.3)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert sent[0] == "otp"
+    assert sent[1] == "status"
+    assert len(sent) == 3
+    assert "repeated 2 more time" in sent[2]
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_coalesces_sustained_repeats(monkeypatch):
+    """Test a steady stream of identical messages yields one message and one notice."""
+    monkeypatch.setattr("src.telegram_bot.COALESCE_WINDOW_SECONDS", 0.1)
+    monkeypatch.setattr("src.telegram_bot.PER_CHAT_INTERVAL_SECONDS", 0)
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+    bot._start_senders()
+
+    for _ in range(10):
+        await bot.send_admin_message("error")
+        await asyncio.sleep(0.03)
+    await asyncio.sleep(0.3)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert len(sent) == 2
+    assert sent[0] == "error"
+    assert "repeated 9 more time" in sent[1]
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_repeat_notice_with_otp_mid_burst(monkeypatch):
+    """Test the repeat notice quotes its message when an OTP is sent in between."""
+    monkeypatch.setattr("src.telegram_bot.PER_CHAT_INTERVAL_SECONDS", 0.1)
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+    bot._start_senders()
+
+    await bot.send_admin_message("status")
+    await asyncio.sleep(0.05)
+    await bot.send_admin_message("status")
+    await bot.send_admin_message("status")
+    await asyncio.sleep(0.01)
+    await bot.send_admin_message("otp", priority=PRIORITY_OTP)
+    await asyncio.sleep(0.5)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert sent[0] == "status"
+    assert "otp" in sent
+    notices = [text for text in sent if "repeated" in text]
+    assert len(notices) == 1
+    assert "repeated 2 more time" in notices[0]
+    assert notices[0].endswith("\n\nstatus")
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_stop_senders_flushes_repeat_notice(monkeypatch):
+    """Test a pending repeat notice is still sent when the senders stop."""
+    monkeypatch.setattr("src.telegram_bot.PER_CHAT_INTERVAL_SECONDS", 0)
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+    bot._start_senders()
+
+    await bot.send_admin_message("status")
+    await bot.send_admin_message("status")
+    await asyncio.sleep(0.1)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert sent[0] == "status"
+    assert len(sent) == 2
+    assert "repeated 1 more time" in sent[1]
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_per_chat_queues(monkeypatch):
+    """Test a slow admin chat does not hold up delivery to the others."""
+    monkeypatch.setattr("src.telegram_bot.PER_CHAT_INTERVAL_SECONDS", 0)
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[111, 222],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    slow_chat_released = asyncio.Event()
+
+    async def send_message(chat_id, **kwargs):
+        if chat_id == 111:
+            await slow_chat_released.wait()
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock(side_effect=send_message)
+    bot._start_senders()
+
+    await bot.send_admin_message("first")
+    await bot.send_admin_message("second")
+    await asyncio.sleep(0.1)
+
+    sent_to_fast = [
+        call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list
+        if call.kwargs['chat_id'] == 222
+    ]
+    assert sent_to_fast == ["first", "second"]
+
+    slow_chat_released.set()
+    await asyncio.sleep(0.1)
+    await bot._stop_senders()
+
+    sent_to_slow = [
+        call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list
+        if call.kwargs['chat_id'] == 111
+    ]
+    assert sent_to_slow == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_stop_senders_flushes_waiting_messages():
+    """Test messages waiting out the per-chat interval are sent on shutdown."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+    bot._start_senders()
+
+    await bot.send_admin_message("one")
+    await bot.send_admin_message("two")
+    await asyncio.sleep(0.1)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert sent == ["one", "two"]
+
+    # A message waiting out a Telegram back-off is not lost either
+    bot.application.bot.send_message = AsyncMock(side_effect=[RetryAfter(5), None])
+    bot._start_senders()
+
+    await bot.send_admin_message("three")
+    await asyncio.sleep(0.1)
+    await bot._stop_senders()
+
+    sent = [call.kwargs['text'] for call in bot.application.bot.send_message.call_args_list]
+    assert sent == ["three", "three"]
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_logs_command(monkeypatch, tmp_path):
+    """Test /logs replies inline for short tails and as a document for long ones."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    log_file = tmp_path / "bot.log"
+    log_file.write_text("".join(f"line {i} `quoted`\n" for i in range(50)))
+    monkeypatch.setenv("LOG_FILE", str(log_file))
+
+    update = MagicMock()
+    update.effective_chat.id = 123456789
+    update.message.reply_text = AsyncMock()
+    update.message.reply_document = AsyncMock()
+    context = MagicMock()
+
+    context.args = ["5"]
+    await bot.logs_command(update, context)
+    reply = update.message.reply_text.call_args.args[0]
+    assert "line 49 \\`quoted\\`" in reply
+    assert "line 44" not in reply
+
+    log_file.write_text(("y" * 100 + "\n") * 100)
+    context.args = ["100"]
+    await bot.logs_command(update, context)
+    update.message.reply_document.assert_called_once()
+
+    # Escaping can double the length of backslash-heavy lines
+    log_file.write_text(("C:\\logs\\" * 10 + "\n") * 40)
+    context.args = ["40"]
+    await bot.logs_command(update, context)
+    assert update.message.reply_document.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_uptime_formatting():
+    """Test uptime string formatting and per-minute caching."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot._start_monotonic = time.monotonic() - timedelta(days=1, hours=2, minutes=3).total_seconds()
+    assert bot._get_uptime() == "1d 2h 3m"
+
+    # Cached value is reused within the same minute
+    assert bot._get_uptime() == "1d 2h 3m"
+
+    bot._start_monotonic = time.monotonic() - timedelta(minutes=5).total_seconds()
+    assert bot._get_uptime() == "5m"
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_otp_count_cache():
+    """Test OTP count is cached until invalidated."""
+    storage = MagicMock()
+    storage.get_otp_count = AsyncMock(side_effect=[0, 1])
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=storage,
+        monitor_manager=None
+    )
+
+    assert await bot._get_otp_count() == 0
+    assert await bot._get_otp_count() == 0
+    assert storage.get_otp_count.call_count == 1
+
+    bot.invalidate_otp_count()
+    assert await bot._get_otp_count() == 1
+    assert storage.get_otp_count.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_otp_count_invalidated_during_fetch():
+    """Test a count invalidated while being fetched is not cached."""
+    storage = MagicMock()
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=storage,
+        monitor_manager=None
+    )
+
+    async def get_otp_count():
+        if storage.get_otp_count.call_count == 1:
+            bot.invalidate_otp_count()
+            return 0
+        return 1
+
+    storage.get_otp_count = AsyncMock(side_effect=get_otp_count)
+
+    assert await bot._get_otp_count() == 0
+    assert await bot._get_otp_count() == 1
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_status_cache():
+    """Test /status text is reused until bot state changes."""
+    storage = MagicMock()
+    storage.get_otp_count = AsyncMock(side_effect=[0, 1])
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=storage,
+        monitor_manager=None
+    )
+
+    status_text = await bot._build_status_text()
+    assert "Last Fetch: Never" in status_text
+    assert "Total OTPs: 0" in status_text
+    assert await bot._build_status_text() is status_text
+    assert storage.get_otp_count.call_count == 1
+
+    bot.update_fetch_time()
+    status_text = await bot._build_status_text()
+    assert "Last Fetch: Never" not in status_text
+
+    bot.invalidate_otp_count()
+    status_text = await bot._build_status_text()
+    assert "Total OTPs: 1" in status_text
+    assert storage.get_otp_count.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_status_invalidated_during_build():
+    """Test /status text is not cached if state changes while it is built."""
+    storage = MagicMock()
+
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=storage,
+        monitor_manager=None
+    )
+
+    async def get_otp_count():
+        bot.update_fetch_time()
+        return 0
+
+    storage.get_otp_count = AsyncMock(side_effect=get_otp_count)
+
+    status_text = await bot._build_status_text()
+    assert "Last Fetch: Never" in status_text
+    assert "Last Fetch: Never" not in await bot._build_status_text()
+
+
+@pytest.mark.asyncio
+async def test_telegram_bot_error_message_keeps_raise_site():
+    """Test error notifications include the innermost stack frame."""
+    bot = IVASMSTelegramBot(
+        token="test_token",
+        admin_chat_ids=[123456789],
+        storage_manager=None,
+        monitor_manager=None
+    )
+
+    bot.application = MagicMock()
+    bot.application.bot.send_message = AsyncMock()
+
+    def raise_error(depth):
+        if depth == 0:
+            raise ValueError("boom")
+        raise_error(depth - 1)
+
+    try:
+        raise_error(10)
+    except ValueError as e:
+        await bot.send_error_message(e, "Test")
+
+    sent = bot.application.bot.send_message.call_args.kwargs['text']
+    assert 'raise ValueError("boom")' in sent
+
+
 @pytest.mark.asyncio
 async def test_end_to_end_otp_flow(storage_manager, mock_telegram_bot, sample_otps):
     """Test complete OTP processing flow."""